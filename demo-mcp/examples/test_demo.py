@@ -49,7 +49,7 @@ class MockMCPClient:
     async def read_text_file(self, file_path: str):
         return {"filename": Path(file_path).name, "content_type": "text", "status": "mock_success"}
     
-    async def read_json_file(self, file_path: str):
+    async def read_json_file(self, file_path: str, max_items=None):
         return {"filename": Path(file_path).name, "content_type": "json", "status": "mock_success"}
     
     async def read_csv_file(self, file_path: str, delimiter: str = ",", max_rows=None):
@@ -68,12 +68,11 @@ class MockMCPClient:
         return [{"id": "mock_db_id", "title": "Mock Database", "status": "mock_success"}]
 
 
-async def test_file_reading():
+async def test_file_reading(client: MockMCPClient):
     """Test file reading tools"""
     print("\n📖 Testing File Reading Tools")
     print("=" * 40)
     
-    client = MockMCPClient()
     examples_dir = Path(__file__).parent
     
     # Test reading different file types
@@ -105,13 +104,11 @@ async def test_file_reading():
         result = await client.call_tool(test["tool"], test["args"])
 
 
-async def test_notion_integration():
+async def test_notion_integration(client: MockMCPClient):
     """Test Notion integration tools"""
     print("\n📝 Testing Notion Integration Tools")
     print("=" * 40)
     
-    client = MockMCPClient()
-    
     # Mock database ID (replace with real one for actual testing)
     mock_db_id = "mock-database-id-12345"
     
@@ -146,12 +143,11 @@ async def test_notion_integration():
         result = await client.call_tool(test["tool"], test["args"])
 
 
-async def demo_workflow():
+async def demo_workflow(client: MockMCPClient):
     """Demonstrate a complete workflow"""
     print("\n🚀 Complete Workflow Demonstration")
     print("=" * 40)
     
-    client = MockMCPClient()
     examples_dir = Path(__file__).parent
     
     print("\n1. Discovering files in examples directory...")
@@ -160,27 +156,37 @@ async def demo_workflow():
         "file_extensions": [".json", ".csv", ".md"]
     })
     
-    print("\n2. Reading project data from JSON...")
-    json_result = await client.call_tool("read_json_file", {
-        "file_path": str(examples_dir / "sample_data.json")
-    })
+    print("\n2. Reading discovered files concurrently...")
+    read_tools = {".json": "read_json_file", ".csv": "read_csv_file"}
+    async with asyncio.TaskGroup() as tg:
+        read_tasks = [
+            tg.create_task(client.call_tool(
+                read_tools.get(Path(file_path).suffix.lower(), "read_text_file"),
+                {"file_path": file_path}
+            ))
+            for file_path in files_result.get("files", [])
+        ]
+    read_results = [task.result() for task in read_tasks]
+    print(f"   Read {len(read_results)} files")
     
-    print("\n3. Processing employee data from CSV...")
-    csv_result = await client.call_tool("read_csv_file", {
-        "file_path": str(examples_dir / "sample_data.csv"),
-        "max_rows": 3
-    })
-    
-    print("\n4. Creating Notion pages from files...")
+    print("\n3. Creating Notion pages from files...")
     # In a real scenario, you'd use actual database IDs
     mock_db_id = "your-actual-database-id-here"
     
-    for filename in ["sample_data.json", "sample_data.csv", "test_document.md"]:
-        page_result = await client.call_tool("create_notion_page_from_file", {
-            "database_id": mock_db_id,
-            "file_path": str(examples_dir / filename),
-            "page_title": f"Imported: {filename}"
-        })
+    # Pages are independent, so create them concurrently (capped for Notion's rate limit)
+    semaphore = asyncio.Semaphore(8)
+    
+    async def create_page(filename: str):
+        async with semaphore:
+            return await client.call_tool("create_notion_page_from_file", {
+                "database_id": mock_db_id,
+                "file_path": str(examples_dir / filename),
+                "page_title": f"Imported: {filename}"
+            })
+    
+    page_results = await asyncio.gather(
+        *(create_page(filename) for filename in ["sample_data.json", "sample_data.csv", "test_document.md"])
+    )
     
     print("\n✅ Workflow completed successfully!")
 
@@ -235,10 +241,11 @@ async def main():
     print("This is a demonstration of the MCP server capabilities.")
     print("The tests below use mock responses to show the expected workflow.")
     
-    # Run all test suites
-    await test_file_reading()
-    await test_notion_integration()
-    await demo_workflow()
+    # Run all test suites against a single shared client
+    client = MockMCPClient()
+    await test_file_reading(client)
+    await test_notion_integration(client)
+    await demo_workflow(client)
     
     # Show setup instructions
     print_setup_instructions()
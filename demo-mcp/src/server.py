@@ -7,17 +7,26 @@ This server provides tools to:
 2. Create pages in Notion using the Notion API
 """
 
+import asyncio
+import csv
+import itertools
 import json
+import mmap
 import os
+import random
+import stat
+import sys
+import time
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 import logging
 
 try:
-    import aiofiles
-    import pandas as pd
+    import httpx
     from fastmcp import FastMCP
     from notion_client import AsyncClient
+    from notion_client.errors import HTTPResponseError
     from pydantic import BaseModel
     from dotenv import load_dotenv
 except ImportError as e:
@@ -25,6 +34,12 @@ except ImportError as e:
     print("Please run: pip install -r requirements.txt")
     exit(1)
 
+# Optional: orjson serializes large JSON documents much faster than the stdlib
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Load environment variables
 load_dotenv()
 
@@ -41,10 +56,38 @@ if not notion_token:
     logger.warning("NOTION_API_KEY not found in environment variables")
     notion_client = None
 else:
-    notion_client = AsyncClient(auth=notion_token)
+    # One pooled HTTP/2 session is reused for every Notion request. The client's
+    # built-in retries are off so _notion_call is the only retry layer.
+    notion_client = AsyncClient(
+        auth=notion_token,
+        retry=False,
+        client=httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=50)
+        )
+    )
+
+# Database listings change rarely, so cache them briefly
+_DB_TTL = 60.0
+_db_cache: Optional[Tuple[float, List[Dict[str, Any]]]] = None
+
 
+# Text files larger than this are read through mmap
+MMAP_THRESHOLD = 1 << 20
 
-class FileContent(BaseModel):
+# Notion accepts at most 2000 characters per rich text object and 100 blocks per request
+NOTION_TEXT_CHUNK = 1900
+NOTION_MAX_CHILDREN = 100
+
+# Rate limits are always retried; gateway errors only for reads, since a failed
+# write may already have been applied and retrying it could duplicate pages or blocks
+NOTION_WRITE_RETRY_STATUSES = (429,)
+NOTION_READ_RETRY_STATUSES = (429, 502, 503)
+NOTION_MAX_ATTEMPTS = 5
+
+
+@dataclass(slots=True)
+class FileContent:
     """Model for file content response"""
     filename: str
     content_type: str
@@ -53,6 +96,176 @@ class FileContent(BaseModel):
     encoding: str = "utf-8"
 
 
+def _stat_file(file_path: str) -> os.stat_result:
+    """Check that a path is a regular file with a single stat call"""
+    try:
+        st = os.stat(file_path)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"File not found: {file_path}") from None
+    if not stat.S_ISREG(st.st_mode):
+        raise ValueError(f"Path is not a file: {file_path}")
+    return st
+
+
+def _read_text_sync(file_path: str, file_size: int) -> str:
+    """Read a whole text file in a single blocking call, given its size from _stat_file"""
+    if file_size > MMAP_THRESHOLD:
+        # Decode straight from the mapped pages instead of an intermediate bytes copy.
+        # Files with CR line endings need newline translation, so text mode handles those.
+        with open(file_path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if mm.find(b'\r') == -1:
+                return str(mm, 'utf-8')
+    with open(file_path, 'r', encoding='utf-8') as file:
+        return file.read()
+
+
+def _read_json_sync(file_path: str, max_items: Optional[int] = None) -> Any:
+    """Parse a JSON file straight from its file object in a single blocking call"""
+    with open(file_path, 'rb') as file:
+        # Stdlib parsing on purpose: orjson turns integers beyond 64 bits into floats
+        content = json.load(file)
+    if max_items is not None and isinstance(content, list):
+        content = content[:max_items]
+    return content
+
+
+def _read_csv_sync(file_path: str, delimiter: str = ",", max_rows: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Read CSV rows as dictionaries, stopping early once max_rows is reached"""
+    with open(file_path, 'r', newline='', encoding='utf-8') as file:
+        reader = csv.DictReader(file, delimiter=delimiter)
+        if max_rows is not None:
+            return list(itertools.islice(reader, max_rows))
+        return list(reader)
+
+
+def _csv_preview_sync(file_path: str, delimiter: str = ",", preview: int = 10) -> Tuple[List[str], List[List[str]], int]:
+    """Read the CSV header and first preview rows, counting the rest without keeping them"""
+    with open(file_path, 'r', newline='', encoding='utf-8') as file:
+        reader = csv.reader(file, delimiter=delimiter)
+        headers = next(reader, [])
+        # Skip blank lines, as DictReader does
+        rows = list(itertools.islice((row for row in reader if row), preview))
+        total_rows = len(rows) + sum(1 for row in reader if row)
+    return headers, rows, total_rows
+
+
+def _retry_after_seconds(headers: httpx.Headers) -> Optional[float]:
+    """Return the Retry-After delay in seconds, if the header holds one"""
+    try:
+        return max(float(headers.get("retry-after", "")), 0.0)
+    except ValueError:
+        return None
+
+
+async def _notion_call(coro_fn, *args, retry_statuses: Tuple[int, ...] = NOTION_WRITE_RETRY_STATUSES, **kwargs) -> Any:
+    """Call a Notion API method, retrying transient errors after Retry-After or jittered exponential backoff"""
+    for attempt in range(NOTION_MAX_ATTEMPTS):
+        try:
+            return await coro_fn(*args, **kwargs)
+        except HTTPResponseError as e:
+            # Covers APIResponseError and UnknownHTTPResponseError (e.g. HTML 502 pages)
+            if e.status not in retry_statuses or attempt == NOTION_MAX_ATTEMPTS - 1:
+                raise
+            delay = _retry_after_seconds(e.headers)
+            if delay is None:
+                delay = 2 ** attempt + random.random()
+            delay = min(delay, 30)
+            logger.warning("Notion API returned %s, retrying in %.1fs", e.status, delay)
+            await asyncio.sleep(delay)
+
+
+def _name_prop(title: str) -> Dict[str, Any]:
+    """Build the Notion "Name" title property for a page"""
+    return {"Name": {"title": [{"text": {"content": title}}]}}
+
+
+def _paragraph_block(text: str) -> Dict[str, Any]:
+    """Build a Notion paragraph block holding a single piece of text"""
+    return {
+        "object": "block",
+        "type": "paragraph",
+        "paragraph": {
+            "rich_text": [
+                {
+                    "type": "text",
+                    "text": {
+                        "content": text
+                    }
+                }
+            ]
+        }
+    }
+
+
+def _dumps_indented(content: Any) -> str:
+    """Serialize parsed JSON as indented text, using orjson when available"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(content, option=orjson.OPT_INDENT_2).decode('utf-8')
+        except orjson.JSONEncodeError:
+            # e.g. integers beyond 64 bits, which json.dumps handles
+            pass
+    return json.dumps(content, indent=2)
+
+
+def _render_json(path: Path, file_size: int) -> Tuple[str, Dict[str, Any]]:
+    """Parse a JSON file and render it as indented text"""
+    try:
+        content = _read_json_sync(str(path))
+    except json.JSONDecodeError as e:
+        raise ValueError("Invalid JSON format: %s" % str(e)) from e
+    file_info = {"filename": path.name, "content_type": "json", "file_size": file_size}
+    return _dumps_indented(content), file_info
+
+
+def _render_csv(path: Path, file_size: int) -> Tuple[str, Dict[str, Any]]:
+    """Render a CSV file as a table of its header and first 10 rows"""
+    # Only the header and first 10 rows are kept; the rest are just counted
+    headers, rows, total_rows = _csv_preview_sync(str(path))
+    file_info = {"filename": path.name, "content_type": "csv", "file_size": file_size}
+    # Convert CSV data to readable text
+    if not total_rows:
+        return "Empty CSV file", file_info
+    content_text = f"CSV Data ({total_rows} rows):\n\n"
+    # Add headers
+    content_text += " | ".join(headers) + "\n"
+    content_text += " | ".join(["---"] * len(headers)) + "\n"
+    # Add first 10 rows as sample
+    for row in rows:
+        # Pad or truncate ragged rows so every line has one cell per header
+        content_text += " | ".join((row + [""] * len(headers))[:len(headers)]) + "\n"
+    if total_rows > len(rows):
+        content_text += f"\n... and {total_rows - len(rows)} more rows"
+    return content_text, file_info
+
+
+def _render_text(path: Path, file_size: int) -> Tuple[str, Dict[str, Any]]:
+    """Read a text file as-is"""
+    content_text = _read_text_sync(str(path), file_size)
+    file_info = {"filename": path.name, "content_type": "text", "file_size": len(content_text)}
+    return content_text, file_info
+
+
+# Renderers by file extension; anything else is treated as text
+_RENDERERS = {
+    '.json': _render_json,
+    '.csv': _render_csv,
+}
+
+
+def _load_and_render(file_path: str) -> Tuple[str, Dict[str, Any]]:
+    """
+    Read a file, parse it by extension and render it as page text
+
+    Returns the text together with a plain file_info summary; FileContent
+    models are only built by the read_* tools that return them.
+    """
+    st = _stat_file(file_path)
+    path = Path(file_path)
+    renderer = _RENDERERS.get(path.suffix.lower(), _render_text)
+    return renderer(path, st.st_size)
+
+
 class NotionPageRequest(BaseModel):
     """Model for Notion page creation request"""
     database_id: str
@@ -73,18 +286,11 @@ async def read_text_file(file_path: str) -> FileContent:
         FileContent object with file information and content
     """
     try:
-        path = Path(file_path)
-        if not path.exists():
-            raise FileNotFoundError(f"File not found: {file_path}")
-        
-        if not path.is_file():
-            raise ValueError(f"Path is not a file: {file_path}")
-        
-        async with aiofiles.open(file_path, mode='r', encoding='utf-8') as file:
-            content = await file.read()
+        st = _stat_file(file_path)
+        content = await asyncio.to_thread(_read_text_sync, file_path, st.st_size)
         
         return FileContent(
-            filename=path.name,
+            filename=Path(file_path).name,
             content_type="text",
             content=content,
             size=len(content),
@@ -97,34 +303,30 @@ async def read_text_file(file_path: str) -> FileContent:
 
 
 @mcp.tool()
-async def read_json_file(file_path: str) -> FileContent:
+async def read_json_file(file_path: str, max_items: Optional[int] = None) -> FileContent:
     """
     Read and parse content from a JSON file
     
     Args:
         file_path: Path to the JSON file to read
+        max_items: Maximum number of items to return for top-level arrays (optional)
         
     Returns:
         FileContent object with parsed JSON data
     """
     try:
-        path = Path(file_path)
-        if not path.exists():
-            raise FileNotFoundError(f"File not found: {file_path}")
-        
-        async with aiofiles.open(file_path, mode='r', encoding='utf-8') as file:
-            content_str = await file.read()
+        st = _stat_file(file_path)
         
         try:
-            content = json.loads(content_str)
+            content = await asyncio.to_thread(_read_json_sync, file_path, max_items)
         except json.JSONDecodeError as e:
             raise ValueError("Invalid JSON format: %s" % str(e)) from e
         
         return FileContent(
-            filename=path.name,
+            filename=Path(file_path).name,
             content_type="json",
             content=content,
-            size=len(content_str),
+            size=st.st_size,
             encoding="utf-8"
         )
     
@@ -147,24 +349,16 @@ async def read_csv_file(file_path: str, delimiter: str = ",", max_rows: Optional
         FileContent object with CSV data as list of dictionaries
     """
     try:
-        path = Path(file_path)
-        if not path.exists():
-            raise FileNotFoundError(f"File not found: {file_path}")
-        
-        # Read CSV using pandas for better handling
-        df = pd.read_csv(file_path, delimiter=delimiter, nrows=max_rows)
-        
-        # Convert to list of dictionaries
-        content = df.to_dict('records')
+        st = _stat_file(file_path)
         
-        # Get file size
-        file_size = path.stat().st_size
+        # Read CSV rows as a list of dictionaries
+        content = await asyncio.to_thread(_read_csv_sync, file_path, delimiter, max_rows)
         
         return FileContent(
-            filename=path.name,
+            filename=Path(file_path).name,
             content_type="csv",
             content=content,
-            size=file_size,
+            size=st.st_size,
             encoding="utf-8"
         )
     
@@ -193,11 +387,15 @@ async def list_files_in_directory(directory_path: str, file_extensions: Optional
         if not path.is_dir():
             raise ValueError(f"Path is not a directory: {directory_path}")
         
+        allowed = frozenset(ext.lower() for ext in file_extensions) if file_extensions is not None else None
+        
+        # DirEntry.is_file() uses the file type cached by scandir, avoiding a stat per entry
         files = []
-        for item in path.iterdir():
-            if item.is_file():
-                if file_extensions is None or item.suffix.lower() in [ext.lower() for ext in file_extensions]:
-                    files.append(str(item))
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    if allowed is None or os.path.splitext(entry.name)[1].lower() in allowed:
+                        files.append(entry.path)
         
         return {
             "directory": str(path),
@@ -229,50 +427,51 @@ async def create_notion_page(database_id: str, title: str, content: Optional[str
     
     try:
         # Prepare page properties
-        page_properties = {
-            "Name": {
-                "title": [
-                    {
-                        "text": {
-                            "content": title
-                        }
-                    }
-                ]
-            }
-        }
+        page_properties = _name_prop(title)
         
         # Add custom properties if provided
         if properties:
             page_properties.update(properties)
         
-        # Prepare page content/children
+        # Split content into paragraph blocks that fit Notion's rich text limit
         children = []
         if content:
-            children.append({
-                "object": "block",
-                "type": "paragraph",
-                "paragraph": {
-                    "rich_text": [
-                        {
-                            "type": "text",
-                            "text": {
-                                "content": content
-                            }
-                        }
-                    ]
-                }
-            })
+            children = [
+                _paragraph_block(content[i:i + NOTION_TEXT_CHUNK])
+                for i in range(0, len(content), NOTION_TEXT_CHUNK)
+            ]
         
-        # Create the page
+        # Create the page with as many blocks as a single request allows
         page_data = {
             "parent": {"database_id": database_id},
             "properties": page_properties
         }
         
         if children:
-            page_data["children"] = children
+            page_data["children"] = children[:NOTION_MAX_CHILDREN]
+        
+        response = await _notion_call(notion_client.pages.create, **page_data)
         
-        response = await notion_client.pages.create(**page_data)
+        # Append the remaining blocks in order, one batch per request
+        try:
+            for i in range(NOTION_MAX_CHILDREN, len(children), NOTION_MAX_CHILDREN):
+                await _notion_call(
+                    notion_client.blocks.children.append,
+                    block_id=response["id"],
+                    children=children[i:i + NOTION_MAX_CHILDREN]
+                )
+        except Exception as e:
+            # Don't leave a half-filled page behind; archive it so a retry won't duplicate it
+            try:
+                await _notion_call(notion_client.pages.update, page_id=response["id"], archived=True)
+                state = "archived"
+            except Exception as archive_error:
+                logger.error("Error archiving partial Notion page %s: %s", response["id"], str(archive_error))
+                state = "left partially filled"
+            raise RuntimeError(
+                f"Failed to add content to Notion page {response['id']} ({response['url']}); "
+                f"page was {state}: {e}"
+            ) from e
         
         return {
             "page_id": response["id"],
@@ -301,36 +500,11 @@ async def create_notion_page_from_file(database_id: str, file_path: str, page_ti
         Dictionary with created page information and file content summary
     """
     try:
-        # Read file content based on extension
-        path = Path(file_path)
-        extension = path.suffix.lower()
-        
-        if extension == '.json':
-            file_content = await read_json_file(file_path)
-            content_text = json.dumps(file_content.content, indent=2)
-        elif extension == '.csv':
-            file_content = await read_csv_file(file_path)
-            # Convert CSV data to readable text
-            if isinstance(file_content.content, list) and file_content.content:
-                content_text = f"CSV Data ({len(file_content.content)} rows):\n\n"
-                # Add headers
-                headers = list(file_content.content[0].keys())
-                content_text += " | ".join(headers) + "\n"
-                content_text += " | ".join(["---"] * len(headers)) + "\n"
-                # Add first 10 rows as sample
-                for row in file_content.content[:10]:
-                    content_text += " | ".join(str(row.get(h, "")) for h in headers) + "\n"
-                if len(file_content.content) > 10:
-                    content_text += f"\n... and {len(file_content.content) - 10} more rows"
-            else:
-                content_text = "Empty CSV file"
-        else:
-            # Default to text file
-            file_content = await read_text_file(file_path)
-            content_text = file_content.content
+        # Read, parse and render the file in a single worker thread
+        content_text, file_info = await asyncio.to_thread(_load_and_render, file_path)
         
         # Use custom title or filename
-        title = page_title or f"File: {file_content.filename}"
+        title = page_title or f"File: {file_info['filename']}"
         
         # Create Notion page
         page_result = await create_notion_page(
@@ -341,11 +515,7 @@ async def create_notion_page_from_file(database_id: str, file_path: str, page_ti
         
         return {
             **page_result,
-            "file_info": {
-                "filename": file_content.filename,
-                "content_type": file_content.content_type,
-                "file_size": file_content.size
-            }
+            "file_info": file_info
         }
     
     except Exception as e:
@@ -364,8 +534,16 @@ async def get_notion_databases() -> List[Dict[str, Any]]:
     if not notion_client:
         raise RuntimeError("Notion API key not configured. Please set NOTION_API_KEY environment variable.")
     
+    global _db_cache
+    if _db_cache and time.monotonic() - _db_cache[0] < _DB_TTL:
+        return _db_cache[1]
+    
     try:
-        response = await notion_client.search(filter={"property": "object", "value": "database"})
+        response = await _notion_call(
+            notion_client.search,
+            filter={"property": "object", "value": "database"},
+            retry_statuses=NOTION_READ_RETRY_STATUSES
+        )
         
         databases = []
         for db in response.get("results", []):
@@ -381,6 +559,7 @@ async def get_notion_databases() -> List[Dict[str, Any]]:
                 "last_edited_time": db.get("last_edited_time", "")
             })
         
+        _db_cache = (time.monotonic(), databases)
         return databases
     
     except Exception as e:
@@ -389,5 +568,16 @@ async def get_notion_databases() -> List[Dict[str, Any]]:
 
 
 if __name__ == "__main__":
+    # Use uvloop's faster event loop when it is installed (not available on Windows).
+    # Event loop policies are deprecated from Python 3.14 and slated for removal, and
+    # mcp.run() gives no other way to pick the loop, so this is deliberately limited
+    # to older versions; newer ones run on the default loop.
+    if sys.version_info < (3, 14):
+        try:
+            import uvloop
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        except ImportError:
+            pass
+    
     # Run the server
     mcp.run()
\ No newline at end of file